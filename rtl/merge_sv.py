@@ -1,18 +1,48 @@
 import os
-import glob
+import sys
+import shutil
+
+# Chunk size for the portable streaming copy (1 MiB)
+COPY_BUFSIZE = 1024 * 1024
+
+def _copy_contents(infile, outfile):
+    """
+    Streams the whole of infile into outfile without reading it into memory.
+    On Linux this uses os.sendfile, so the data never leaves the kernel;
+    elsewhere (or if sendfile is refused) it falls back to copyfileobj.
+    """
+    if sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+        # Push any buffered header bytes out before writing behind Python's back
+        outfile.flush()
+        size = os.fstat(infile.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(outfile.fileno(), infile.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except OSError:
+            if offset:
+                raise
+    shutil.copyfileobj(infile, outfile, COPY_BUFSIZE)
 
 def concatenate_sv_files(input_directory, output_filename):
     """
     Concatenates all .sv files in the given directory into a single file.
     """
-    # Create the full path for the search pattern
-    search_pattern = os.path.join(input_directory, "*.sv")
-    
-    # Get a list of all matching files
-    files = glob.glob(search_pattern)
-    
-    # Sort files to ensure deterministic order (optional, but recommended)
-    files.sort()
+    output_abs = os.path.abspath(output_filename)
+
+    # One directory scan; DirEntry carries the file type, so no extra stat.
+    # Hidden files are skipped (as glob's "*.sv" did), as is a previous
+    # run's output so it is never merged back into itself.
+    with os.scandir(input_directory) as it:
+        files = sorted(
+            e.path for e in it
+            if e.name.endswith(".sv") and not e.name.startswith(".")
+            and e.is_file() and os.path.abspath(e.path) != output_abs
+        )
 
     if not files:
         print(f"No .sv files found in {input_directory}")
@@ -20,25 +50,25 @@ def concatenate_sv_files(input_directory, output_filename):
 
     print(f"Found {len(files)} files. Merging...")
 
-    with open(output_filename, 'w') as outfile:
+    # Binary mode: .sv sources are ASCII, so skip the text codec entirely
+    with open(output_filename, 'wb') as outfile:
         for file_path in files:
             file_name = os.path.basename(file_path)
-            
+
             # Create a separator to make the merged file readable
             header = f"\n// {'='*60}\n// SOURCE FILE: {file_name}\n// {'='*60}\n"
             
-            try:
-                with open(file_path, 'r') as infile:
-                    # Write the header
-                    outfile.write(header)
-                    # Write the file content
-                    outfile.write(infile.read())
-                    # Ensure there is a newline at the end of each file block
-                    outfile.write("\n")
-                    
-                print(f"Added: {file_name}")
-            except IOError as e:
-                print(f"Error reading {file_name}: {e}")
+            # An unreadable source aborts the merge rather than silently
+            # producing an incomplete design file
+            with open(file_path, 'rb') as infile:
+                # Write the header
+                outfile.write(header.encode())
+                # Stream the file content
+                _copy_contents(infile, outfile)
+                # Ensure there is a newline at the end of each file block
+                outfile.write(b"\n")
+
+            print(f"Added: {file_name}")
 
     print(f"\nSuccess! All files merged into: {output_filename}")
 
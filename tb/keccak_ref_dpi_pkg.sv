@@ -0,0 +1,42 @@
+// ==========================================================
+// DPI-C bindings to the Python/Numba Keccak golden model
+// ----------------------------------------------------------
+// Lets a testbench compare the DUT against the reference
+// round on the fly, without generating vectors on disk.
+//
+// Build the shared library and run with it:
+//   make dpi_ref
+//   export PYTHONPATH=$PROJECT_ROOT/verif/python_testing
+//   vsim -sv_lib verif/python_testing/ref_keccak_dpi ...
+//
+// This package is not compiled by default; add it to the
+// vlog line of a testbench that uses it.
+// ==========================================================
+`timescale 1ns/1ps
+
+package keccak_ref_dpi_pkg;
+    import keccak_pkg::*;
+
+    // Flat state: lane (x, y) at index x + 5*y (see keccak_numba.py)
+    // Returns 0 on success, -1 if the Python model could not be loaded
+    import "DPI-C" function int ref_keccak_round(
+        inout  longint unsigned state[25],
+        input  longint unsigned rc
+    );
+
+    // Applies one reference round to an RTL-layout state [x][y][z]
+    function automatic void ref_round_state(
+        inout logic [ROW_SIZE-1:0][COL_SIZE-1:0][LANE_SIZE-1:0] state,
+        input longint unsigned rc
+    );
+        longint unsigned flat [25];
+        for (int y = 0; y < COL_SIZE; y++)
+            for (int x = 0; x < ROW_SIZE; x++)
+                flat[x + 5*y] = state[x][y];
+        if (ref_keccak_round(flat, rc) != 0)
+            $fatal(1, "keccak_ref_dpi_pkg: reference model unavailable (check PYTHONPATH)");
+        for (int y = 0; y < COL_SIZE; y++)
+            for (int x = 0; x < ROW_SIZE; x++)
+                state[x][y] = flat[x + 5*y];
+    endfunction
+endpackage
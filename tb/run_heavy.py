@@ -3,6 +3,8 @@ import os
 import subprocess
 import re
 import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- CONFIGURATION ---
 MAKEFILE_TARGET = "keccak_core_heavy_tb"
@@ -13,11 +15,43 @@ LOG_FILE = "regression.log"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 
-def run_simulation(test_id=None):
+# Captures ID from "Test_18_SHAKE" OR "ID:18"
+# Logic: Look for "FAIL" or "FATAL", then grab digits after "Test_" or "ID:"
+FAIL_PATTERN = re.compile(r"(?:FAIL|FATAL).*?(?:Test_|ID:)(\d+)")
+
+def run_regression():
+    """
+    Runs the full regression, scanning vsim's output line by line as it is
+    produced instead of waiting for the whole log.
+    Returns (log_lines, failed_ids).
+    """
     cmd = ["make", f"run_{MAKEFILE_TARGET}"]
 
-    if test_id is not None:
-        cmd = ["make", "run_heavy_fail", f"TEST_ID={test_id}"]
+    log_lines = []
+    failed_ids = set()
+    with subprocess.Popen(
+        cmd,
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as proc:
+        for line in proc.stdout:
+            log_lines.append(line)
+            match = FAIL_PATTERN.search(line)
+            if match:
+                fid = int(match.group(1))
+                if fid not in failed_ids:
+                    failed_ids.add(fid)
+                    print(f"    Found Failure: Vector ID {fid}")
+
+    return log_lines, failed_ids
+
+def run_simulation(test_id, vcd_name=None):
+    cmd = ["make", "run_heavy_fail", f"TEST_ID={test_id}"]
+    if vcd_name is not None:
+        cmd.append(f"VCD_NAME={vcd_name}")
 
     result = subprocess.run(
         cmd,
@@ -28,56 +62,63 @@ def run_simulation(test_id=None):
     )
     return result.stdout
 
+def resim_failure(fid, fail_dir_abs):
+    """
+    Re-runs one failing vector with waves enabled and archives its VCD.
+    Each ID dumps to its own VCD name, so several can run at once.
+    Returns the archived VCD path, or None if no VCD was produced.
+    """
+    vcd_name = f"fail_id_{fid}.vcd"
+    run_simulation(test_id=fid, vcd_name=vcd_name)
+
+    src_vcd = Path(PROJECT_ROOT, vcd_name)
+    dst_vcd = Path(fail_dir_abs, vcd_name)
+
+    # A single rename; a missing source means vsim produced no VCD
+    try:
+        src_vcd.replace(dst_vcd)
+    except FileNotFoundError:
+        return None
+    return str(dst_vcd)
+
 def main():
     fail_dir_abs = os.path.join(PROJECT_ROOT, VCD_DIR)
     if not os.path.exists(fail_dir_abs):
         os.makedirs(fail_dir_abs)
 
     print(f"[-] Starting Full Regression (No Waves)...")
-    log = run_simulation(test_id=None)
+    log_lines, failed_ids = run_regression()
 
     # Save Log
     log_path = os.path.join(PROJECT_ROOT, LOG_FILE)
     with open(log_path, "w") as f:
-        f.write(log)
+        f.writelines(log_lines)
     print(f"[-] Full simulation log saved to: {LOG_FILE}")
 
-    # --- UPDATED REGEX ---
-    # Captures ID from "Test_18_SHAKE" OR "ID:18"
-    # Logic: Look for "FAIL" or "FATAL", then grab digits after "Test_" or "ID:"
-    fail_pattern = re.compile(r"(?:FAIL|FATAL).*?(?:Test_|ID:)(\d+)")
-    # ---------------------
-
-    failed_ids = set()
-    for line in log.splitlines():
-        match = fail_pattern.search(line)
-        if match:
-            fid = int(match.group(1))
-            failed_ids.add(fid)
-            # Optional: Print found failure to console immediately
-            # print(f"    Found Failure: Vector ID {fid}")
-
     if not failed_ids:
         print("[+] All tests passed! No VCDs generated.")
-        for line in log.splitlines():
+        for line in log_lines:
             if "Loaded" in line and "vectors" in line:
                 print(f"    Verified: {line.strip()}")
         sys.exit(0)
 
     print(f"[-] {len(failed_ids)} failures detected. Generating VCDs...")
 
-    for fid in failed_ids:
-        print(f"    ... Re-simulating ID {fid} ...")
-        run_simulation(test_id=fid)
-
-        src_vcd = os.path.join(PROJECT_ROOT, f"{MAKEFILE_TARGET}.vcd")
-        dst_vcd = os.path.join(fail_dir_abs, f"fail_id_{fid}.vcd")
-
-        if os.path.exists(src_vcd):
-            os.replace(src_vcd, dst_vcd)
-            print(f"    Saved wave: {dst_vcd}")
-        else:
-            print(f"    Error: VCD not generated for ID {fid}")
+    # Each re-simulation is an independent vsim process, so run one per core.
+    # Threads are enough here: they only wait on their subprocess.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {}
+        for fid in sorted(failed_ids):
+            print(f"    ... Re-simulating ID {fid} ...")
+            futures[pool.submit(resim_failure, fid, fail_dir_abs)] = fid
+
+        for future in as_completed(futures):
+            fid = futures[future]
+            dst_vcd = future.result()
+            if dst_vcd is not None:
+                print(f"    Saved wave: {dst_vcd}")
+            else:
+                print(f"    Error: VCD not generated for ID {fid}")
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,7 @@
 import sys
 import re
 import os
+import mmap
 import argparse
 
 # ==============================================================================
@@ -8,6 +9,21 @@ import argparse
 # ==============================================================================
 DEFAULT_LIMIT = 3  # Default number of vectors to extract per file
 
+# One anchored alternation for every line type we care about, so each
+# .rsp line costs a single regex match. Bytes pattern + MULTILINE lets us
+# scan the mmap'd file directly; [ \t]* (not \s*) keeps a field from
+# spilling over onto the next line.
+_PAT = re.compile(
+    rb"^[ \t]*(?:"
+    rb"\[Outputlen[ \t]*=[ \t]*(?P<olh>\d+)\]"         # [Outputlen = N] header
+    rb"|Outputlen[ \t]*=[ \t]*(?P<oll>\d+)"              # per-test output length
+    rb"|Len[ \t]*=[ \t]*(?P<len>\d+)"                    # message length (bits)
+    rb"|Msg[ \t]*=[ \t]*(?P<msg>[0-9a-fA-F]+)"            # message data
+    rb"|(?:MD|Output)[ \t]*=[ \t]*(?P<md>[0-9a-fA-F]+)"   # expected digest
+    rb")",
+    re.MULTILINE,
+)
+
 def get_mode_from_filename(filename):
     """Derives the SystemVerilog Enum mode from the filename."""
     base = os.path.basename(filename).upper()
@@ -23,20 +39,17 @@ def get_mode_from_filename(filename):
         return None, None
 
 def parse_rsp_file(filepath, output_file, limit=None):
+    """
+    Writes up to `limit` vectors from one .rsp file to output_file.
+    Returns the extracted vectors as (mode, out_len, msg, digest) tuples.
+    """
     filename = os.path.basename(filepath)
     print(f"Processing {filename}...", end=" ")
 
     mode, default_out_len = get_mode_from_filename(filepath)
     if not mode:
         print(f"\n  [WARN] Could not determine Keccak Mode. Skipping.")
-        return
-
-    # Regex patterns
-    re_len = re.compile(r"^Len\s*=\s*(\d+)")
-    re_msg = re.compile(r"^Msg\s*=\s*([0-9a-fA-F]+)")
-    re_md  = re.compile(r"^(MD|Output)\s*=\s*([0-9a-fA-F]+)")
-    re_outlen_header = re.compile(r"\[Outputlen\s*=\s*(\d+)\]")
-    re_outlen_line = re.compile(r"^Outputlen\s*=\s*(\d+)")
+        return []
 
     # State variables
     # Initialize current_len to None so we don't accidentally treat
@@ -47,46 +60,38 @@ def parse_rsp_file(filepath, output_file, limit=None):
 
     count_extracted = 0
     count_total = 0
+    extracted = []
+
+    with open(filepath, 'rb') as f:
+        # mmap can't map an empty file; there is nothing to parse anyway
+        if os.fstat(f.fileno()).st_size == 0:
+            data = b""
+        else:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        for m in _PAT.finditer(data):
+            g = m.lastgroup
+
+            # 1. Header Output Length / 2. Per-Test Output Length (VariableOut)
+            if g == "olh" or g == "oll":
+                current_out_len = int(m.group(g))
+
+            # 3. Message Length
+            elif g == "len":
+                current_len = int(m.group(g))
 
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            # 1. Check for Header Output Length
-            m_header = re_outlen_header.search(line)
-            if m_header:
-                current_out_len = int(m_header.group(1))
-                continue
-
-            # 2. Check for Per-Test Output Length (Common in VariableOut)
-            m_outlen = re_outlen_line.search(line)
-            if m_outlen:
-                current_out_len = int(m_outlen.group(1))
-                continue
-
-            # 3. Check for Message Length
-            m_len = re_len.search(line)
-            if m_len:
-                current_len = int(m_len.group(1))
-                continue
-
-            # 4. Check for Message Data
-            m_msg = re_msg.search(line)
-            if m_msg:
-                current_msg = m_msg.group(1)
+            # 4. Message Data
+            elif g == "msg":
+                current_msg = m.group(g).decode()
 
                 # Only force "EMPTY" if we explicitly saw a Len=0 line.
                 # In VariableOut files, current_len remains None, so we keep the hex.
                 if current_len is not None and current_len == 0:
                     current_msg = "EMPTY"
-                continue
 
-            # 5. Check for Output Hash (Trigger to write)
-            m_md = re_md.search(line)
-            if m_md:
-                digest = m_md.group(2)
+            # 5. Output Hash (Trigger to write)
+            elif g == "md":
+                digest = m.group(g).decode()
                 count_total += 1
 
                 # STOP if we hit the limit
@@ -99,6 +104,7 @@ def parse_rsp_file(filepath, output_file, limit=None):
 
                 # Write to output
                 output_file.write(f"{mode} {current_out_len} {current_msg} {digest}\n")
+                extracted.append((mode, current_out_len, current_msg, digest))
                 count_extracted += 1
 
                 # Reset for next block
@@ -108,12 +114,41 @@ def parse_rsp_file(filepath, output_file, limit=None):
                 elif default_out_len is not None:
                      current_out_len = default_out_len
 
+        if isinstance(data, mmap.mmap):
+            data.close()
+
     # Print summary for this file
     if limit is not None and count_total > limit:
         print(f"-> Extracted {count_extracted} (Skipped {count_total - count_extracted})")
     else:
         print(f"-> Extracted {count_extracted} (All)")
 
+    return extracted
+
+def check_vectors(vectors, mismatch_path):
+    """
+    Recomputes every extracted vector with the batched Python Keccak model
+    (8 messages per batch, grouped by mode and output length) and compares
+    digests in memory. Only mismatches are written to disk.
+    Returns the number of mismatches.
+    """
+    # The golden models live next to this script and need NumPy, so only
+    # import them when --check is requested
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_testing"))
+    from keccak_batch import check_vectors as batch_check_vectors
+
+    print(f"Checking {len(vectors)} vectors against the Python golden model...", end=" ")
+    mismatches = batch_check_vectors(vectors)
+    if not mismatches:
+        print("-> All match")
+        return 0
+
+    print(f"-> {len(mismatches)} MISMATCHES, written to {mismatch_path}")
+    with open(mismatch_path, 'w') as mm_f:
+        for mode, out_len, msg, digest, got in mismatches:
+            mm_f.write(f"{mode} {out_len} {msg} {digest} {got}\n")
+    return len(mismatches)
+
 def main():
     parser = argparse.ArgumentParser(description="Parse NIST Keccak .rsp files for SystemVerilog TB.")
 
@@ -127,6 +162,12 @@ def main():
     parser.add_argument('--full', action='store_true',
                         help=f'Parse ALL vectors. If not set, limits to {DEFAULT_LIMIT} per file.')
 
+    parser.add_argument('--check', action='store_true',
+                        help='Also verify every extracted vector against the Python golden model.')
+
+    parser.add_argument('--mismatches', type=str, default='mismatches.txt',
+                        help='Where --check writes failing vectors (default: mismatches.txt)')
+
     args = parser.parse_args()
 
     # Determine limit
@@ -136,9 +177,13 @@ def main():
     if limit:
         print(f"Limiting to {limit} vectors per file (use --full to process all).")
 
+    vectors = []
     with open(args.output, 'w') as out_f:
         for f_path in args.files:
-            parse_rsp_file(f_path, out_f, limit)
+            vectors.extend(parse_rsp_file(f_path, out_f, limit))
+
+    if args.check and check_vectors(vectors, args.mismatches):
+        sys.exit(1)
 
     print("Done.")
 
@@ -0,0 +1,60 @@
+/*
+ * File Name: keccak_avx512.c
+ * Description:
+ * - AVX-512 implementation of the ρ (Rho) step for the Python golden model.
+ * - The 25 lanes (x + 5*y order) are held in four zmm registers: three full
+ *   8-lane vectors plus a masked single-lane vector for lane 24, so the
+ *   state buffer is never read or written past its 25 lanes.
+ * - Each vector is rotated with one vprolvq (_mm512_rolv_epi64), which takes
+ *   a per-lane rotate count, exactly what ρ needs.
+ * - The AVX-512 code is compiled via a target attribute, so the library loads
+ *   on any x86-64 CPU; callers must check has_avx512f() before calling rho().
+ * - Build: make python_avx512 (loaded from rho_step.py through ctypes and
+ *   only used when keccak_rho is called with use_avx512=True).
+ */
+
+#include <stdint.h>
+#include <immintrin.h>
+
+// Rotation offsets in x + 5*y order, padded to 32 lanes for aligned vectors
+static const uint64_t RHO_OFFSETS[32] __attribute__((aligned(64))) = {
+     0,  1, 62, 28, 27,
+    36, 44,  6, 55, 20,
+     3, 10, 43, 25, 39,
+    41, 45, 15, 21,  8,
+    18,  2, 61, 56, 14,
+     0,  0,  0,  0,  0,  0,  0
+};
+
+/*
+ * Returns 1 if the running CPU supports AVX-512F, 0 otherwise.
+ */
+int has_avx512f(void)
+{
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx512f") ? 1 : 0;
+}
+
+/*
+ * Rotates each of the 25 lanes of s left by its ρ offset, in place.
+ */
+__attribute__((target("avx512f")))
+void rho(uint64_t s[25])
+{
+    const __mmask8 last = 0x01;
+
+    __m512i lo  = _mm512_loadu_si512((const void *)(s + 0));
+    __m512i mid = _mm512_loadu_si512((const void *)(s + 8));
+    __m512i hi  = _mm512_loadu_si512((const void *)(s + 16));
+    __m512i top = _mm512_maskz_loadu_epi64(last, s + 24);
+
+    lo  = _mm512_rolv_epi64(lo,  _mm512_load_si512((const void *)(RHO_OFFSETS + 0)));
+    mid = _mm512_rolv_epi64(mid, _mm512_load_si512((const void *)(RHO_OFFSETS + 8)));
+    hi  = _mm512_rolv_epi64(hi,  _mm512_load_si512((const void *)(RHO_OFFSETS + 16)));
+    top = _mm512_rolv_epi64(top, _mm512_load_si512((const void *)(RHO_OFFSETS + 24)));
+
+    _mm512_storeu_si512((void *)(s + 0), lo);
+    _mm512_storeu_si512((void *)(s + 8), mid);
+    _mm512_storeu_si512((void *)(s + 16), hi);
+    _mm512_mask_storeu_epi64(s + 24, last, top);
+}
@@ -0,0 +1,123 @@
+/*
+ * File Name: ref_keccak_dpi.c
+ * Description:
+ * - DPI-C shim that lets a SystemVerilog testbench call the Numba golden
+ *   model (keccak_numba.ref_keccak_round) in-process, instead of going
+ *   through vector files on disk.
+ * - On the first call it starts an embedded Python interpreter, imports
+ *   keccak_numba and caches the native address of the ref_keccak_round
+ *   cfunc. Every later call is a plain C function-pointer call into the
+ *   Numba-compiled round; no Python objects are touched and the GIL is
+ *   not needed.
+ * - keccak_numba must be importable: put verif/python_testing on
+ *   PYTHONPATH before starting the simulator. If it is not, the first call
+ *   prints the Python error and every call returns -1 without retrying,
+ *   so the testbench can $fatal instead of checking an unpermuted state.
+ * - Simulators dlopen -sv_lib libraries with RTLD_LOCAL, which hides
+ *   libpython's symbols from the extension modules numpy loads. Before
+ *   starting Python, ref_init re-opens libpython (REF_PYLIB, its soname,
+ *   passed in by the Makefile) with RTLD_GLOBAL.
+ * - Build: make dpi_ref, then pass -sv_lib verif/python_testing/ref_keccak_dpi
+ *   to vsim. This needs a 64-bit simulator: Numba only runs on 64-bit
+ *   Python, so the 32-bit ModelSim-Intel setup in the README cannot load it.
+ * - SV side: tb/keccak_ref_dpi_pkg.sv
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <dlfcn.h>
+#include <stdint.h>
+#include <stdio.h>
+
+#ifndef REF_PYLIB
+#error "REF_PYLIB must name libpython's soname; build with make dpi_ref"
+#endif
+
+typedef void (*ref_round_fn)(uint64_t *state, uint64_t rc);
+
+static ref_round_fn ref_round = NULL;
+
+// Set once loading has failed, so the import is not retried on every call
+static int ref_failed = 0;
+
+// Keeps the cfunc object (and with it the compiled code) alive
+static PyObject *ref_cfunc = NULL;
+
+/*
+ * Imports keccak_numba and resolves ref_keccak_round's native address.
+ * Returns 0 on success, -1 on failure (the Python error is printed once).
+ */
+static int ref_init(void)
+{
+    PyGILState_STATE gil;
+    PyObject *mod = NULL;
+    PyObject *addr = NULL;
+    int rc = -1;
+
+    if (ref_round != NULL)
+        return 0;
+    if (ref_failed)
+        return -1;
+
+    if (!Py_IsInitialized()) {
+        // Promote libpython to global scope so numpy's extension modules
+        // can resolve the C API against it
+        if (dlopen(REF_PYLIB, RTLD_NOW | RTLD_GLOBAL) == NULL) {
+            fprintf(stderr, "ref_keccak_dpi: cannot load %s: %s\n", REF_PYLIB, dlerror());
+            ref_failed = 1;
+            return -1;
+        }
+        Py_InitializeEx(0);
+        // Py_InitializeEx leaves this thread holding the GIL; release it so
+        // the Ensure/Release pair below works the same either way
+        PyEval_SaveThread();
+    }
+
+    gil = PyGILState_Ensure();
+
+    mod = PyImport_ImportModule("keccak_numba");
+    if (mod == NULL)
+        goto out;
+
+    ref_cfunc = PyObject_GetAttrString(mod, "ref_keccak_round");
+    if (ref_cfunc == NULL)
+        goto out;
+
+    addr = PyObject_GetAttrString(ref_cfunc, "address");
+    if (addr == NULL)
+        goto out;
+
+    ref_round = (ref_round_fn)PyLong_AsVoidPtr(addr);
+    if (ref_round == NULL && PyErr_Occurred())
+        goto out;
+
+    rc = 0;
+
+out:
+    if (rc != 0) {
+        fprintf(stderr, "ref_keccak_dpi: failed to load keccak_numba.ref_keccak_round\n");
+        PyErr_Print();
+        Py_CLEAR(ref_cfunc);
+        ref_round = NULL;
+        ref_failed = 1;
+    }
+    Py_XDECREF(addr);
+    Py_XDECREF(mod);
+    PyGILState_Release(gil);
+    return rc;
+}
+
+/*
+ * import "DPI-C" function int ref_keccak_round(
+ *     inout longint unsigned state[25], input longint unsigned rc);
+ *
+ * Applies one Keccak-f[1600] round to state (lane (x, y) at x + 5*y).
+ * Returns 0 on success, or -1 (state untouched) if the model is unavailable.
+ */
+int ref_keccak_round(unsigned long long *state, unsigned long long rc)
+{
+    if (ref_init() != 0)
+        return -1;
+    ref_round((uint64_t *)state, (uint64_t)rc);
+    return 0;
+}
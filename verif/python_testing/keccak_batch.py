@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+Batched Keccak-f[1600] golden model (Keccak-xN) built on NumPy.
+
+N independent states are held as one (N, 25) numpy.uint64 array, row n being
+a flat state with lane (x, y) at column x + 5*y. Every step is a whole-array
+ufunc or gather, so θ, ρ, π, χ and ι run across all N states at once.
+
+Run as a script to hash every vector in a parse_nist_vectors.py output file
+and compare against the expected digests:
+    python keccak_batch.py ../vectors.txt
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+import keccak_bi
+from state import LANE_X, NEXT, NEXT2, PI_PERM, RHO_INV_OFFSETS, RHO_OFFSETS, ROUND_CONSTANTS
+
+# θ/ρ tables permuted into π's output order, so the three steps run as one
+# gather: B[:, j] comes from lane PI_PERM[j]
+PI_LANE_X = LANE_X[PI_PERM]
+PI_RHO_OFFSETS = RHO_OFFSETS[PI_PERM]
+PI_RHO_INV_OFFSETS = RHO_INV_OFFSETS[PI_PERM]
+
+# Messages hashed per batch by sha3_x8_batch (Keccak-x8)
+BATCH_WIDTH = 8
+
+# Sponge parameters per mode: (rate in bytes, domain separation suffix)
+MODE_PARAMS = {
+    "SHA3_256": (136, 0x06),
+    "SHA3_512": (72,  0x06),
+    "SHAKE128": (168, 0x1F),
+    "SHAKE256": (136, 0x1F),
+}
+
+
+def keccak_round_batch(states, rc):
+    """
+    Perform one Keccak-f[1600] round on a batch of states.
+    states: numpy.uint64 array of shape (N, 25).
+    rc: 64-bit round constant for this round.
+    Returns a new (N, 25) array after θ, ρ, π, χ and ι.
+    """
+    # θ: column parities, D[x] = C[x-1] ^ rotl(C[x+1], 1)
+    C = np.bitwise_xor.reduce(states.reshape(-1, 5, 5), axis=1)
+    Cn = np.roll(C, -1, axis=1)
+    D = np.roll(C, 1, axis=1) ^ ((Cn << np.uint64(1)) | (Cn >> np.uint64(63)))
+
+    # π gather, then θ's D and ρ's rotate applied in the permuted lane order
+    B = states[:, PI_PERM] ^ D[:, PI_LANE_X]
+    B = (B << PI_RHO_OFFSETS) | (B >> PI_RHO_INV_OFFSETS)
+
+    # χ: non-linear row mixing
+    states = B ^ ((~B[:, NEXT]) & B[:, NEXT2])
+
+    # ι: round constant into lane (0,0)
+    states[:, 0] ^= rc
+    return states
+
+
+def keccak_f1600_batch(states):
+    """
+    Apply all 24 rounds of Keccak-f[1600] to a (N, 25) batch of states.
+    Returns a new (N, 25) array.
+    """
+    for rc in ROUND_CONSTANTS:
+        states = keccak_round_batch(states, rc)
+    return states
+
+
+def _pad(msg, rate, suffix):
+    """Appends the domain suffix and FIPS 202 pad10*1 up to a multiple of rate."""
+    padded = bytearray(msg)
+    padded.append(suffix)
+    padded.extend(bytes(-len(padded) % rate))
+    padded[-1] |= 0x80
+    return padded
+
+
+def sponge_batch(msgs, mode, out_bits, permute=keccak_f1600_batch):
+    """
+    Hash a list of byte messages with the same mode and output length.
+    Messages may differ in length; states that run out of blocks early are
+    left untouched while the longer messages finish absorbing.
+    permute: (N, 25) -> (N, 25) permutation, e.g. keccak_bi.keccak_f1600_batch.
+    Returns a list of digests (bytes), one per message.
+    """
+    rate, suffix = MODE_PARAMS[mode]
+    rate_lanes = rate // 8
+    out_bytes = out_bits // 8
+
+    padded = [_pad(m, rate, suffix) for m in msgs]
+    n_blocks = np.array([len(p) // rate for p in padded])
+    max_blocks = int(n_blocks.max())
+
+    # (N, max_blocks, rate_lanes) little-endian lanes, zero beyond each message
+    blocks = np.zeros((len(msgs), max_blocks * rate), dtype=np.uint8)
+    for n, p in enumerate(padded):
+        blocks[n, :len(p)] = np.frombuffer(bytes(p), dtype=np.uint8)
+    blocks = blocks.view("<u8").astype(np.uint64).reshape(len(msgs), max_blocks, rate_lanes)
+
+    # Absorb
+    states = np.zeros((len(msgs), 25), dtype=np.uint64)
+    for b in range(max_blocks):
+        active = n_blocks > b
+        if active.all():
+            states[:, :rate_lanes] ^= blocks[:, b]
+            states = permute(states)
+        else:
+            sub = states[active]
+            sub[:, :rate_lanes] ^= blocks[active, b]
+            states[active] = permute(sub)
+
+    # Squeeze
+    out = []
+    squeezed = 0
+    while squeezed < out_bytes:
+        if squeezed:
+            states = permute(states)
+        out.append(np.ascontiguousarray(states[:, :rate_lanes], dtype="<u8").view(np.uint8))
+        squeezed += rate
+    digests = np.concatenate(out, axis=1)[:, :out_bytes]
+    return [row.tobytes() for row in digests]
+
+
+def sha3_x8_batch(msgs, mode, out_bits, permute=keccak_f1600_batch):
+    """
+    Hash messages of one mode and output length, BATCH_WIDTH at a time.
+    Returns a list of digests (bytes), one per message.
+    """
+    digests = []
+    for i in range(0, len(msgs), BATCH_WIDTH):
+        digests.extend(sponge_batch(msgs[i:i + BATCH_WIDTH], mode, out_bits, permute))
+    return digests
+
+
+def check_vectors(vectors, permute=keccak_f1600_batch):
+    """
+    Recompute the digest of every (mode, out_len, msg_hex, digest_hex) vector,
+    as written by parse_nist_vectors.py, grouped by (mode, out_len).
+    msg_hex may be "EMPTY" for the zero-length message.
+    Returns the mismatches as (mode, out_len, msg_hex, digest_hex, got_hex).
+    """
+    groups = defaultdict(list)
+    for mode, out_len, msg, digest in vectors:
+        groups[(mode, int(out_len))].append((msg, digest))
+
+    mismatches = []
+    for (mode, out_len), group in groups.items():
+        msgs = [b"" if msg == "EMPTY" else bytes.fromhex(msg) for msg, _ in group]
+        results = sha3_x8_batch(msgs, mode, out_len, permute)
+        for (msg, digest), result in zip(group, results):
+            if result.hex() != digest.lower():
+                mismatches.append((mode, out_len, msg, digest, result.hex()))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a vectors.txt file against the batched Keccak model.")
+    parser.add_argument('vectors', type=str, help='Vector file produced by parse_nist_vectors.py')
+    parser.add_argument('--bi', action='store_true',
+                        help='Use the bit-interleaved 32-bit model (default only on 32-bit hosts).')
+    args = parser.parse_args()
+
+    use_bi = args.bi or keccak_bi.USE_BI
+    permute = keccak_bi.keccak_f1600_batch if use_bi else keccak_f1600_batch
+    if use_bi:
+        print("Using bit-interleaved (32-bit) Keccak model.")
+
+    with open(args.vectors, 'r') as f:
+        vectors = [line.split() for line in f if line.strip()]
+
+    mismatches = check_vectors(vectors, permute)
+    if mismatches:
+        for mode, out_len, msg, digest, got in mismatches:
+            short_msg = msg if len(msg) <= 32 else msg[:32] + "..."
+            print(f"  MISMATCH {mode} {out_len} {short_msg}: expected {digest}, got {got}")
+        print(f"FAIL: {len(mismatches)} of {len(vectors)} vectors mismatch")
+        sys.exit(1)
+    print(f"PASS: all {len(vectors)} vectors match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+"""
+Bit-interleaved Keccak-f[1600] golden model for 32-bit targets.
+
+Each 64-bit lane is split into its even bits and its odd bits, stored as two
+uint32 words (FIPS 202 / XKCP "bit interleaving"). A 64-bit rotate by r then
+becomes two 32-bit rotates: by r/2 on both halves when r is even, or by
+(r+1)/2 and (r-1)/2 with the halves swapped when r is odd. The state is a
+(..., 25, 2) numpy.uint32 array, [..., x + 5*y, 0] holding the even bits and
+[..., x + 5*y, 1] the odd bits, so one state or a batch of N run the same code.
+
+keccak_f1600_batch() keeps the (N, 25) uint64 interface of keccak_batch.py,
+so the sponge can use this model instead. It is only selected by default
+when the interpreter itself is 32-bit (USE_BI); pass --bi to keccak_batch.py
+to force it.
+"""
+
+import sys
+
+import numpy as np
+
+from state import LANE_X, NEXT, NEXT2, PI_PERM, RHO_OFFSETS, ROUND_CONSTANTS
+
+# Use the interleaved model by default only on 32-bit hosts
+USE_BI = sys.maxsize < 2**32
+
+# Portable Morton (un)shuffle stages: (shift, mask after the shift)
+_COMPACT_STEPS = (
+    (1, 0x3333333333333333),
+    (2, 0x0F0F0F0F0F0F0F0F),
+    (4, 0x00FF00FF00FF00FF),
+    (8, 0x0000FFFF0000FFFF),
+    (16, 0x00000000FFFFFFFF),
+)
+_SPREAD_STEPS = (
+    (16, 0x0000FFFF0000FFFF),
+    (8, 0x00FF00FF00FF00FF),
+    (4, 0x0F0F0F0F0F0F0F0F),
+    (2, 0x3333333333333333),
+    (1, 0x5555555555555555),
+)
+
+
+def _compact(x):
+    """Gathers the even bits of each uint64 in x into its low 32 bits."""
+    x = x & np.uint64(0x5555555555555555)
+    for shift, mask in _COMPACT_STEPS:
+        x = (x | (x >> np.uint64(shift))) & np.uint64(mask)
+    return x.astype(np.uint32)
+
+
+def _spread(v):
+    """Inverse of _compact: moves bit i of each uint32 to bit 2i of a uint64."""
+    x = np.asarray(v, dtype=np.uint64)
+    for shift, mask in _SPREAD_STEPS:
+        x = (x | (x << np.uint64(shift))) & np.uint64(mask)
+    return x
+
+
+def bit_interleave(x):
+    """
+    Splits 64-bit lane(s) x into (even bits, odd bits) as two uint32 values.
+    """
+    x = np.asarray(x, dtype=np.uint64)
+    return _compact(x), _compact(x >> np.uint64(1))
+
+
+def bit_deinterleave(even, odd):
+    """
+    Rebuilds 64-bit lane(s) from their (even bits, odd bits) halves.
+    """
+    return _spread(even) | (_spread(odd) << np.uint64(1))
+
+
+def to_bi(states):
+    """Converts (..., 25) uint64 states to (..., 25, 2) interleaved uint32."""
+    even, odd = bit_interleave(states)
+    return np.stack([even, odd], axis=-1)
+
+
+def from_bi(states_bi):
+    """Converts (..., 25, 2) interleaved uint32 states back to (..., 25) uint64."""
+    return bit_deinterleave(states_bi[..., 0], states_bi[..., 1])
+
+
+# ρ on interleaved lanes: odd offsets swap the halves first, then the even
+# half rotates by ceil(r/2) and the odd half by floor(r/2)
+RHO_SWAP = (RHO_OFFSETS % np.uint64(2)).astype(bool)
+RHO_ROT_EVEN = ((RHO_OFFSETS + np.uint64(1)) // np.uint64(2)).astype(np.uint32)
+RHO_ROT_ODD = (RHO_OFFSETS // np.uint64(2)).astype(np.uint32)
+
+# Round constants, pre-split into their even and odd halves
+RC_EVEN, RC_ODD = bit_interleave(ROUND_CONSTANTS)
+
+
+def _rotl32(v, n):
+    """Rotate uint32 value(s) left by n; (32 - n) & 31 keeps n = 0 in range."""
+    n = np.uint32(n) if np.isscalar(n) else n
+    return (v << n) | (v >> ((np.uint32(32) - n) & np.uint32(31)))
+
+
+def keccak_round_bi(states_bi, r):
+    """
+    Perform one Keccak-f[1600] round on bit-interleaved state(s).
+    states_bi: numpy.uint32 array of shape (..., 25, 2).
+    r: round index (0-23), selecting the interleaved round constant.
+    Returns a new (..., 25, 2) array after θ, ρ, π, χ and ι.
+    """
+    E = states_bi[..., 0]
+    O = states_bi[..., 1]
+
+    # θ: column parities per half; rotl64(C, 1) is (rotl32(C_odd, 1), C_even)
+    shape = E.shape[:-1] + (5, 5)
+    CE = np.bitwise_xor.reduce(E.reshape(shape), axis=-2)
+    CO = np.bitwise_xor.reduce(O.reshape(shape), axis=-2)
+    DE = np.roll(CE, 1, axis=-1) ^ _rotl32(np.roll(CO, -1, axis=-1), 1)
+    DO = np.roll(CO, 1, axis=-1) ^ np.roll(CE, -1, axis=-1)
+    E = E ^ DE[..., LANE_X]
+    O = O ^ DO[..., LANE_X]
+
+    # ρ: swap halves for odd offsets, then two 32-bit rotates
+    E, O = np.where(RHO_SWAP, O, E), np.where(RHO_SWAP, E, O)
+    E = _rotl32(E, RHO_ROT_EVEN)
+    O = _rotl32(O, RHO_ROT_ODD)
+
+    # π: lane permutation as a gather on both halves
+    E = E[..., PI_PERM]
+    O = O[..., PI_PERM]
+
+    # χ: bitwise, so it applies to each half independently
+    E = E ^ ((~E[..., NEXT]) & E[..., NEXT2])
+    O = O ^ ((~O[..., NEXT]) & O[..., NEXT2])
+
+    # ι
+    E[..., 0] ^= RC_EVEN[r]
+    O[..., 0] ^= RC_ODD[r]
+
+    return np.stack([E, O], axis=-1)
+
+
+def keccak_f1600_bi(states_bi):
+    """
+    Apply all 24 rounds of Keccak-f[1600] to bit-interleaved state(s).
+    """
+    for r in range(24):
+        states_bi = keccak_round_bi(states_bi, r)
+    return states_bi
+
+
+def keccak_f1600_batch(states):
+    """
+    Drop-in for keccak_batch.keccak_f1600_batch: takes and returns (N, 25)
+    uint64 states, interleaving only on the way in and out.
+    """
+    return from_bi(keccak_f1600_bi(to_bi(states)))
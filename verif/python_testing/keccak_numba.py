@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Fused Keccak-f[1600] round (θ, ρ, π, χ, ι) compiled with Numba.
+
+The per-step scripts in this directory mirror the RTL step modules one to one
+and are kept for stepping through a single mapping. This module is the fast
+golden model: the state is a flat numpy.uint64[25] array indexed as
+s[x + 5*y], and all five steps are applied in place with scalar 64-bit ops.
+θ, ρ and π are fused into a single pass over the state.
+
+ref_keccak_round is the same round exported as a C-callable function, so a
+SystemVerilog testbench can call the reference model in-process over DPI-C
+(see csrc/ref_keccak_dpi.c and tb/keccak_ref_dpi_pkg.sv).
+"""
+
+import numpy as np
+from numba import carray, cfunc, njit, types, uint64
+
+from state import new_state, print_state_fips
+
+_ONE = np.uint64(1)
+_SIXTY_THREE = np.uint64(63)
+
+# The tables below duplicate the ones in state.py on purpose. Numba freezes
+# global arrays into the compiled code as constants, and cache=True keys the
+# on-disk cache on this file only, so tables imported from state.py would
+# survive an edit there as a stale compiled model in __pycache__.
+
+# Rotation offsets for ρ in s[x + 5*y] order, and the matching right shifts
+RHO_OFFSETS = np.array([
+     0,  1, 62, 28, 27,
+    36, 44,  6, 55, 20,
+     3, 10, 43, 25, 39,
+    41, 45, 15, 21,  8,
+    18,  2, 61, 56, 14,
+], dtype=np.uint64)
+RHO_INV_OFFSETS = (np.uint64(64) - RHO_OFFSETS) & np.uint64(63)
+
+# π as a gather: B[x' + 5y'] = A[PI_PERM[x' + 5y']]
+PI_PERM = np.array([(i % 5 + 3 * (i // 5)) % 5 + 5 * (i % 5) for i in range(25)], dtype=np.intp)
+
+# Round constants RC[0..23] for ι
+ROUND_CONSTANTS = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A,
+    0x8000000080008000, 0x000000000000808B, 0x0000000080000001,
+    0x8000000080008081, 0x8000000000008009, 0x000000000000008A,
+    0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089,
+    0x8000000000008003, 0x8000000000008002, 0x8000000000000080,
+    0x000000000000800A, 0x800000008000000A, 0x8000000080008081,
+    0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)
+
+
+@njit(uint64[:](uint64[:], uint64, uint64[:], uint64[:], uint64[:]), cache=True, boundscheck=False)
+def keccak_round_scratch(state, rc, C, D, B):
+    """
+    Perform one full Keccak-f[1600] round on a flat 25-lane state, in place,
+    using caller-owned scratch buffers so repeated rounds never allocate.
+
+    state: numpy.uint64[25], lane (x, y) stored at state[x + 5*y].
+    rc: 64-bit round constant for this round.
+    C, D: numpy.uint64[5] scratch for θ's column parities and D values.
+    B: numpy.uint64[25] scratch for the ρ/π output read by χ.
+    Returns the same state array after θ, ρ, π, χ and ι.
+    """
+
+    # θ: column parities, then D[x] = C[x-1] ^ rotl(C[x+1], 1)
+    for x in range(5):
+        C[x] = state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20]
+    for x in range(5):
+        c = C[(x + 1) % 5]
+        D[x] = C[(x - 1) % 5] ^ ((c << _ONE) | (c >> _SIXTY_THREE))
+
+    # θ's D[x] is applied as each lane is read, then ρ and π land it in B:
+    # B[j] = rotl(A[src] ^ D[src_x], r[src]) with src = PI_PERM[j], so the
+    # state is read once instead of being rewritten by θ and ρ first
+    for j in range(25):
+        src = PI_PERM[j]
+        v = state[src] ^ D[src % 5]
+        B[j] = (v << RHO_OFFSETS[src]) | (v >> RHO_INV_OFFSETS[src])
+
+    # χ: A[x][y] = B[x][y] ^ ((~B[x+1][y]) & B[x+2][y])
+    for i in range(25):
+        x = i % 5
+        row = i - x
+        state[i] = B[i] ^ ((~B[row + (x + 1) % 5]) & B[row + (x + 2) % 5])
+
+    # ι: XOR the round constant into lane (0,0)
+    state[0] ^= rc
+    return state
+
+
+@njit(uint64[:](uint64[:], uint64), cache=True, boundscheck=False)
+def keccak_round(state, rc):
+    """
+    Perform one full Keccak-f[1600] round on a flat 25-lane state, in place.
+
+    state: numpy.uint64[25], lane (x, y) stored at state[x + 5*y].
+    rc: 64-bit round constant for this round.
+    Returns the same array after θ, ρ, π, χ and ι.
+    """
+    C = np.empty(5, dtype=np.uint64)
+    D = np.empty(5, dtype=np.uint64)
+    B = np.empty(25, dtype=np.uint64)
+    return keccak_round_scratch(state, rc, C, D, B)
+
+
+@njit(uint64[:](uint64[:]), cache=True, boundscheck=False)
+def keccak_f1600(state):
+    """
+    Apply all 24 rounds of Keccak-f[1600] to a flat 25-lane state, in place.
+    The round scratch buffers are allocated once and reused by every round.
+    """
+    C = np.empty(5, dtype=np.uint64)
+    D = np.empty(5, dtype=np.uint64)
+    B = np.empty(25, dtype=np.uint64)
+    for r in range(24):
+        keccak_round_scratch(state, ROUND_CONSTANTS[r], C, D, B)
+    return state
+
+
+@cfunc(types.void(types.CPointer(types.uint64), types.uint64), cache=True)
+def ref_keccak_round(state_ptr, rc):
+    """
+    C ABI entry point: void ref_keccak_round(uint64_t state[25], uint64_t rc).
+    Applies one round to the caller's 25-lane buffer in place; the native
+    address is ref_keccak_round.address.
+    """
+    keccak_round(carray(state_ptr, 25), rc)
+
+
+if __name__ == "__main__":
+    # Known answer: Keccak-f[1600] applied to the all-zero state
+    state = new_state()
+    keccak_f1600(state)
+
+    print("==== Keccak-f[1600] of the all-zero state ====")
+    print_state_fips(state)
+    print(f"Lane (0,0) = 0x{int(state[0]):016x} (expected 0xf1258f7940e1dde7)")
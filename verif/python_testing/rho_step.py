@@ -1,64 +1,76 @@
-def keccak_rho(state):
+import ctypes
+import os
+
+import numpy as np
+
+from state import RHO_INV_OFFSETS, RHO_OFFSETS, new_state, print_state_fips
+
+
+def _load_avx512():
     """
-    Perform the ρ step mapping on a 5x5 array of 64-bit integers.
-    Each lane is rotated left by a position-dependent offset.
-    state: list of 5 lists, each with 5 64-bit integers.
-    Returns a new 5x5 list after ρ step.
+    Loads the optional AVX-512 ρ kernel built by `make python_avx512`.
+    Returns the ctypes library, or None if it is missing or the CPU lacks
+    AVX-512F (keccak_rho then always uses the NumPy shift path).
     """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_keccak_avx512.so")
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+    if not lib.has_avx512f():
+        return None
+    lib.rho.argtypes = [ctypes.POINTER(ctypes.c_uint64)]
+    lib.rho.restype = None
+    return lib
 
-    # Rotation offsets (Y×X grid — matches Verilog layout)
-    OFFSETS = [
-        [  0, 36,  3, 41, 18 ],
-        [  1, 44, 10, 45,  2 ],
-        [ 62,  6, 43, 15, 61 ],
-        [ 28, 55, 25, 21, 56 ],
-        [ 27, 20, 39,  8, 14 ]
-    ]
-
-    def rotl64(value, shift):
-        """Rotate left in 64-bit space."""
-        shift %= 64
-        if shift == 0:
-            return value & 0xFFFFFFFFFFFFFFFF
-        return ((value << shift) & 0xFFFFFFFFFFFFFFFF) | (value >> (64 - shift))
-
-    result = [[0]*5 for _ in range(5)]
-    for x in range(5):
-        for y in range(5):
-            result[x][y] = rotl64(state[x][y], OFFSETS[x][y])
 
-    return result
+_AVX512 = _load_avx512()
 
 
-def print_state_fips(state):
+def keccak_rho(state, use_avx512=False):
     """
-    Prints the 5x5 Keccak state with (0,0) at the center (bottom middle),
-    as specified by FIPS 202, using 16 hex digits per lane.
+    Perform the ρ step mapping on a flat 25-lane Keccak state.
+    Each lane is rotated left by a position-dependent offset.
+    state: numpy.uint64[25], lane (x, y) stored at state[x + 5*y].
+    use_avx512: use the AVX-512 kernel when it is loaded. Off by default:
+    for a single state the ctypes call costs more than the NumPy shifts.
+    Returns a new state array after ρ step.
     """
-    print("Keccak state (FIPS 202 coordinates):\n")
-    for y in range(4, -1, -1):  # print y = 4 down to 0 (top to bottom)
-        row = []
-        for x in range(5):
-            row.append(f"0x{state[x][y]:016x}")
-        print(f"y={y}: " + "  ".join(row))
-    print("     x=0                 x=1                 x=2                 x=3                 x=4\n")
-
-
-
-# Example test: single-bit input state
-state = [[0]*5 for _ in range(5)]
-state[1][0] = 0x1  # single bit set in lane (0,0)
-
-print("Starting State: One bit set at (1,0):")
-print_state_fips(state)
-after_rho = keccak_rho(state)
-print("After rho step: One bit set at (1,0):")
-print_state_fips(after_rho)
-
-print("Starting State: All lanes set to 0x1")
-# Set each lane to value 1
-state = [[1 for _ in range(5)] for _ in range(5)]
-print_state_fips(state)
-print("After rho step: All lanes set to 0x1:")
-after_rho = keccak_rho(state)
-print_state_fips(after_rho)
+
+    if use_avx512 and _AVX512 is not None:
+        # The kernel always reads and writes 25 lanes
+        if state.size != 25:
+            raise ValueError(f"ρ expects a 25-lane state, got {state.size} lanes.")
+
+        # One vprolvq per 8 lanes, applied in place on a private copy
+        result = np.array(state, dtype=np.uint64, copy=True, order="C")
+        _AVX512.rho(result.ctypes.data_as(ctypes.POINTER(ctypes.c_uint64)))
+        return result
+
+    # Rotate every lane at once: RHO_OFFSETS holds the per-lane offset in
+    # x + 5*y order and RHO_INV_OFFSETS the matching (64 - r) & 63 right
+    # shift, so the r = 0 lane at (0,0) passes through unchanged.
+    result = (state << RHO_OFFSETS) | (state >> RHO_INV_OFFSETS)
+
+    return result
+
+
+
+if __name__ == "__main__":
+    # Example test: single-bit input state
+    state = new_state()
+    state[1 + 5*0] = 0x1  # single bit set in lane (0,0)
+
+    print("Starting State: One bit set at (1,0):")
+    print_state_fips(state)
+    after_rho = keccak_rho(state)
+    print("After rho step: One bit set at (1,0):")
+    print_state_fips(after_rho)
+
+    print("Starting State: All lanes set to 0x1")
+    # Set each lane to value 1
+    state = np.ones(25, dtype=np.uint64)
+    print_state_fips(state)
+    print("After rho step: All lanes set to 0x1:")
+    after_rho = keccak_rho(state)
+    print_state_fips(after_rho)
@@ -0,0 +1,72 @@
+"""
+Shared Keccak state helpers and constants for the golden models.
+
+The 5x5 array of 64-bit lanes is stored as one contiguous numpy.uint64[25]
+array (200 bytes), with lane (x, y) at index x + 5*y. A (5, 5) view of the
+same memory is available via state.reshape(5, 5), indexed as [y, x].
+
+keccak_numba.py keeps its own copies of the ρ, π and ι tables (see the note
+there), so a change to a table here must be mirrored in that file.
+"""
+
+import numpy as np
+
+
+def new_state():
+    """
+    Returns an all-zero Keccak state as a flat numpy.uint64[25] array.
+    """
+    return np.zeros(25, dtype=np.uint64)
+
+
+def print_state_fips(state):
+    """
+    Prints the 5x5 Keccak state with (0,0) at the center (bottom middle),
+    as specified by FIPS 202, using 16 hex digits per lane.
+    """
+    # Big-endian bytes make each lane's 16 hex digits read as the number,
+    # so one hex() call formats the whole state
+    h = np.asarray(state, dtype=np.uint64).astype(">u8").tobytes().hex()
+
+    print("Keccak state (FIPS 202 coordinates):\n")
+    for y in range(4, -1, -1):  # print y = 4 down to 0 (top to bottom)
+        row = [f"0x{h[16*(x + 5*y):16*(x + 5*y) + 16]}" for x in range(5)]
+        print(f"y={y}: " + "  ".join(row))
+    print("     x=0                 x=1                 x=2                 x=3                 x=4\n")
+
+
+# Rotation offsets for ρ, flattened to s[x + 5*y] order
+RHO_OFFSETS = np.array([
+     0,  1, 62, 28, 27,
+    36, 44,  6, 55, 20,
+     3, 10, 43, 25, 39,
+    41, 45, 15, 21,  8,
+    18,  2, 61, 56, 14,
+], dtype=np.uint64)
+
+# Matching right-shift amounts, so rotl(v, r) = (v << r) | (v >> (64 - r)).
+# Masking with 63 turns the r = 0 lane into (v << 0) | (v >> 0) = v instead
+# of an out-of-range shift by 64.
+RHO_INV_OFFSETS = (np.uint64(64) - RHO_OFFSETS) & np.uint64(63)
+
+# Column x of every lane, used to broadcast θ's D[x] over a row of 25
+LANE_X = np.arange(25, dtype=np.intp) % 5
+
+# χ neighbours of lane x + 5*y in the same row: (x+1 mod 5, y) and (x+2 mod 5, y)
+NEXT = np.array([(i // 5) * 5 + (i % 5 + 1) % 5 for i in range(25)], dtype=np.intp)
+NEXT2 = np.array([(i // 5) * 5 + (i % 5 + 2) % 5 for i in range(25)], dtype=np.intp)
+
+# π as a gather: B[x' + 5y'] = A[PI_PERM[x' + 5y']] = A[(x' + 3y') mod 5][x']
+PI_PERM = np.array([(i % 5 + 3 * (i // 5)) % 5 + 5 * (i % 5) for i in range(25)], dtype=np.intp)
+
+# Round constants RC[0..23] for ι (FIPS 202, Algorithm 6)
+ROUND_CONSTANTS = np.array([
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A,
+    0x8000000080008000, 0x000000000000808B, 0x0000000080000001,
+    0x8000000080008081, 0x8000000000008009, 0x000000000000008A,
+    0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089,
+    0x8000000000008003, 0x8000000000008002, 0x8000000000000080,
+    0x000000000000800A, 0x800000008000000A, 0x8000000080008081,
+    0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+], dtype=np.uint64)